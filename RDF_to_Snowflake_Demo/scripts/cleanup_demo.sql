@@ -30,6 +30,8 @@ DROP VIEW IF EXISTS SV_OPTIMIZED_PRODUCT_CATALOG;
 
 -- Drop materialized views
 DROP MATERIALIZED VIEW IF EXISTS MV_PRODUCT_ANALYTICS;
+DROP MATERIALIZED VIEW IF EXISTS MV_CUSTOMER_ORDER_TOTALS;
+DROP MATERIALIZED VIEW IF EXISTS MV_PRODUCT_SALES_TOTALS;
 
 -- Drop core semantic views
 DROP VIEW IF EXISTS SV_RELATIONSHIPS;
@@ -6,8 +6,9 @@ and the semantic views created from RDF schemas.
 
 import streamlit as st
 import snowflake.connector
+import html
 import json
-import pandas as pd
+import re
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
@@ -21,8 +22,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling, sent together with the page header so the
+# static chrome costs a single markdown element per rerun
+PAGE_HEADER_HTML = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -60,130 +62,277 @@ st.markdown("""
         border: 1px solid #e0e0e0;
     }
 </style>
-""", unsafe_allow_html=True)
+<h1 class="main-header">🤖 RDF Semantic Chat Assistant</h1>
+<h4>Powered by Snowflake Semantic Views &amp; Cortex Analyst</h4>
+"""
+
+@st.cache_resource(show_spinner=False)
+def _get_session():
+    # Shared by every rerun and browser tab of this process, so the context
+    # is only set once per cold start
+    session = get_active_session()
+    
+    # Set context (a fully qualified schema sets the database too)
+    session.sql("USE SCHEMA RDF_SEMANTIC_DB.SEMANTIC_VIEWS").collect()
+    
+    return session
 
 def initialize_session():
     """Initialize Snowflake session and check semantic views"""
     try:
-        # Get active Snowflake session
-        session = get_active_session()
-        
-        # Set context
-        session.sql("USE DATABASE RDF_SEMANTIC_DB").collect()
-        session.sql("USE SCHEMA SEMANTIC_VIEWS").collect()
-        
-        return session
+        return _get_session()
     except Exception as e:
         st.error(f"Failed to connect to Snowflake: {str(e)}")
         return None
 
+# Semantic view metadata only changes when the setup scripts are re-run, so
+# cache the metadata queries instead of hitting Snowflake on every rerun.
+# The leading underscore on _session tells Streamlit not to hash it, so the
+# account/schema key keeps different deployments from sharing entries.
+# The view list uses a shorter TTL so newly created views show up quickly.
+METADATA_CACHE_TTL = 600
+VIEW_LIST_CACHE_TTL = 60
+
+@st.cache_resource(show_spinner=False)
+def _get_account_key(_session):
+    return f"{_session.get_current_account()}.{_session.get_current_database()}.{_session.get_current_schema()}"
+
+@st.cache_data(ttl=VIEW_LIST_CACHE_TTL, show_spinner=False)
+def _fetch_views(_session, account_key):
+    result = _session.sql("SHOW SEMANTIC VIEWS").collect()
+    return [row[1] for row in result]  # View names are in second column
+
+@st.cache_data(ttl=METADATA_CACHE_TTL, show_spinner=False)
+def _fetch_view_schema(_session, account_key, view_name):
+    # DESCRIBE lists every dimension and metric of the view in one result, so a
+    # view switch costs a single round trip. Each object spans several
+    # property rows; dict keys dedupe names while keeping definition order.
+    result = _session.sql(f"DESCRIBE SEMANTIC VIEW {view_name}").collect()
+    
+    objects = {"DIMENSION": {}, "METRIC": {}}
+    for row in result:
+        # Object kind and name are in the first two columns
+        if row[0] in objects:
+            objects[row[0]][row[1]] = None
+    
+    return list(objects["DIMENSION"]), list(objects["METRIC"])
+
+def clear_metadata_cache():
+    """Drop cached semantic view metadata so the next rerun refetches it"""
+    _fetch_views.clear()
+    _fetch_view_schema.clear()
+
 def get_semantic_views(session):
     """Get available semantic views"""
     try:
-        result = session.sql("SHOW SEMANTIC VIEWS").collect()
-        return [row[1] for row in result]  # View names are in second column
+        return _fetch_views(session, _get_account_key(session))
     except Exception as e:
         st.error(f"Failed to get semantic views: {str(e)}")
         return []
 
-def get_semantic_dimensions(session, view_name):
-    """Get dimensions for a semantic view"""
-    try:
-        result = session.sql(f"SHOW SEMANTIC DIMENSIONS FOR SEMANTIC VIEW {view_name}").collect()
-        return [row[1] for row in result]  # Dimension names in second column
-    except Exception as e:
-        st.error(f"Failed to get dimensions for {view_name}: {str(e)}")
-        return []
-
-def get_semantic_metrics(session, view_name):
-    """Get metrics for a semantic view"""
+def get_view_schema(session, view_name):
+    """Get dimensions and metrics for a semantic view"""
     try:
-        result = session.sql(f"SHOW SEMANTIC METRICS FOR SEMANTIC VIEW {view_name}").collect()
-        return [row[1] for row in result]  # Metric names in second column
+        return _fetch_view_schema(session, _get_account_key(session), view_name)
     except Exception as e:
-        st.error(f"Failed to get metrics for {view_name}: {str(e)}")
-        return []
+        st.error(f"Failed to get dimensions and metrics for {view_name}: {str(e)}")
+        return [], []
 
+# Snowflake only serves a query from its result cache when the SQL text is
+# byte-identical, so generated queries are built on a single line from the
+# constant intent lists. Named filters such as recent_orders are expanded
+# inside the semantic view, so no generated SQL calls CURRENT_DATE() or other
+# non-deterministic functions.
 def query_semantic_view(session, view_name, dimensions=None, metrics=None, filters=None, limit=10):
     """Query semantic view using semantic SQL"""
     try:
-        # Build semantic SQL query
-        dim_list = ", ".join(dimensions) if dimensions else ""
-        metric_list = ", ".join(metrics) if metrics else ""
-        
-        query_parts = []
-        if dim_list:
-            query_parts.append(f"DIMENSIONS ({dim_list})")
-        if metric_list:
-            query_parts.append(f"METRICS ({metric_list})")
+        # Build semantic SQL query. Duplicates are dropped but the requested
+        # order is kept, since the result columns (and the chart axes picked
+        # from them) follow it.
+        query_parts = [view_name]
+        if dimensions:
+            query_parts.append(f"DIMENSIONS ({', '.join(dict.fromkeys(dimensions))})")
+        if metrics:
+            query_parts.append(f"METRICS ({', '.join(dict.fromkeys(metrics))})")
+        if filters:
+            query_parts.append(f"WHERE {filters}")
         
-        where_clause = f"WHERE {filters}" if filters else ""
+        query = f"SELECT * FROM SEMANTIC_VIEW({' '.join(query_parts)}) LIMIT {int(limit)}"
         
-        query = f"""
-        SELECT * FROM SEMANTIC_VIEW(
-            {view_name}
-            {' '.join(query_parts)}
-            {where_clause}
-        )
-        LIMIT {limit}
-        """
-        
-        result = session.sql(query).collect()
-        return result, query
+        # to_pandas() fetches Arrow result batches directly instead of
+        # materializing a Row object per record
+        df = session.sql(query).to_pandas()
+        return df, query
     except Exception as e:
         st.error(f"Failed to query semantic view: {str(e)}")
         return None, None
 
+def query_materialized_view(session, query):
+    """Query a pre-aggregated materialized view, returning (None, None) if unavailable"""
+    try:
+        return session.sql(query).to_pandas(), query
+    except Exception:
+        # The materialized views are optional (they require Enterprise Edition),
+        # so the caller falls back to the semantic view without surfacing an error
+        return None, None
+
+# Intent routing rules in priority order. A rule matches when every keyword
+# group in "keywords" has at least one of its keywords in the question.
+# Rules with a "materialized_query" are answered from the pre-aggregated
+# materialized views created by the optional create_chat_materialized_views.sql,
+# falling back to the semantic view when those views are not available.
+INTENT_RULES = [
+    {
+        "intent": "revenue",
+        "keywords": [("revenue", "sales")],
+        "dimensions": ["PRODUCT_NAME", "CUSTOMER_NAME"],
+        "metrics": ["TOTAL_REVENUE", "ORDER_COUNT"],
+        "filters": None,
+    },
+    {
+        "intent": "top_customers",
+        "keywords": [("customer",), ("top",)],
+        "dimensions": ["CUSTOMER_NAME"],
+        "metrics": ["CUSTOMER_LIFETIME_VALUE", "TOTAL_ORDERS"],
+        "filters": None,
+        "materialized_query": """
+        SELECT c.CUSTOMERNAME as CUSTOMER_NAME, mv.CUSTOMER_LIFETIME_VALUE, mv.TOTAL_ORDERS
+        FROM MV_CUSTOMER_ORDER_TOTALS mv
+        JOIN CUSTOMER c ON c.ID = mv.CUSTOMERID
+        ORDER BY mv.CUSTOMER_LIFETIME_VALUE DESC
+        LIMIT 10
+        """,
+    },
+    {
+        "intent": "top_products",
+        "keywords": [("product",), ("best", "top")],
+        "dimensions": ["PRODUCT_NAME", "CATEGORY_NAME"],
+        "metrics": ["TOTAL_QUANTITY_SOLD", "ORDER_COUNT"],
+        "filters": None,
+        "materialized_query": """
+        SELECT p.PRODUCTNAME as PRODUCT_NAME, c.CATEGORYNAME as CATEGORY_NAME,
+               mv.TOTAL_QUANTITY_SOLD, mv.ORDER_COUNT
+        FROM MV_PRODUCT_SALES_TOTALS mv
+        JOIN PRODUCT p ON p.ID = mv.PRODUCTID
+        LEFT JOIN RELATIONSHIPS r ON p.URI = r.SUBJECT_URI AND r.RELATIONSHIP_TYPE = 'belongsToCategory'
+        LEFT JOIN CATEGORY c ON r.OBJECT_URI = c.URI
+        ORDER BY mv.TOTAL_QUANTITY_SOLD DESC
+        LIMIT 10
+        """,
+    },
+    {
+        "intent": "high_value_orders",
+        "keywords": [("high value", "expensive")],
+        "dimensions": ["CUSTOMER_NAME", "ORDER_DATE"],
+        "metrics": ["TOTAL_REVENUE"],
+        "filters": "high_value_orders",
+    },
+    {
+        "intent": "recent_orders",
+        "keywords": [("recent", "last 30 days")],
+        "dimensions": ["PRODUCT_NAME", "ORDER_DATE"],
+        "metrics": ["TOTAL_REVENUE", "TOTAL_QUANTITY_SOLD"],
+        "filters": "recent_orders",
+    },
+]
+
+DEFAULT_INTENT = {
+    "intent": "default",
+    "keywords": [],
+    "dimensions": ["PRODUCT_NAME", "CUSTOMER_NAME"],
+    "metrics": ["TOTAL_REVENUE", "ORDER_COUNT"],
+    "filters": None,
+}
+
+# Each intent keyword gets one bit, so the keywords found in a question fold
+# into a single integer mask
+_INTENT_KEYWORD_BITS = {
+    keyword: 1 << i
+    for i, keyword in enumerate(sorted(
+        {kw for rule in INTENT_RULES for group in rule["keywords"] for kw in group}
+    ))
+}
+
+# All intent keywords compiled into one alternation so a question is scanned
+# once rather than once per keyword. The alternation sits in a zero-width
+# lookahead, so a match is tried at every position and keywords that overlap
+# (e.g. "productop" holds both "product" and "top") are all found, just like
+# separate `in` checks. Longest keywords go first; a keyword that is a prefix
+# of a longer one would be shadowed where both start.
+_INTENT_KEYWORD_RE = re.compile("(?=(" + "|".join(
+    re.escape(keyword)
+    for keyword in sorted(_INTENT_KEYWORD_BITS, key=len, reverse=True)
+) + "))")
+
+# Keyword groups of every rule, in priority order; also keys the memo below so
+# that editing the rules starts a fresh one
+_INTENT_KEYWORD_GROUPS = tuple(
+    tuple(tuple(group) for group in rule["keywords"]) for rule in INTENT_RULES
+)
+
+# The memo is a plain dict that st.cache_resource hands to every session, so
+# concurrent script threads read and write it. That sharing is intentional:
+# entries are pure functions of the mask, a racing write stores the same value,
+# and single dict get/set operations are atomic under the GIL.
+@st.cache_resource
+def _intent_memo(keyword_groups):
+    """Keyword mask -> index of the winning rule, filled on demand and kept across reruns"""
+    return {}
+
+def _resolve_intent(mask):
+    """Return the index of the first rule whose keyword groups all hit the mask, or None"""
+    for index, groups in enumerate(_INTENT_KEYWORD_GROUPS):
+        if all(any(mask & _INTENT_KEYWORD_BITS[kw] for kw in group) for group in groups):
+            return index
+    return None
+
+def route_intent(question):
+    """Pick the highest-priority intent rule matching a question"""
+    mask = 0
+    for match in _INTENT_KEYWORD_RE.finditer(question.lower()):
+        mask |= _INTENT_KEYWORD_BITS[match.group(1)]
+    
+    memo = _intent_memo(_INTENT_KEYWORD_GROUPS)
+    if mask not in memo:
+        memo[mask] = _resolve_intent(mask)
+    
+    index = memo[mask]
+    return DEFAULT_INTENT if index is None else INTENT_RULES[index]
+
 def simulate_cortex_analyst_query(session, question, semantic_view):
     """Simulate Cortex Analyst natural language query"""
     
     # For demo purposes, we'll map common questions to semantic SQL queries
     # In a real implementation, this would use the actual Cortex Analyst REST API
     
-    question_lower = question.lower()
+    intent = route_intent(question)
     
-    if "revenue" in question_lower or "sales" in question_lower:
-        dimensions = ["PRODUCT_NAME", "CUSTOMER_NAME"]
-        metrics = ["TOTAL_REVENUE", "ORDER_COUNT"]
-        filters = None
-        
-    elif "customer" in question_lower and "top" in question_lower:
-        dimensions = ["CUSTOMER_NAME"]
-        metrics = ["CUSTOMER_LIFETIME_VALUE", "TOTAL_ORDERS"]
-        filters = None
-        
-    elif "product" in question_lower and ("best" in question_lower or "top" in question_lower):
-        dimensions = ["PRODUCT_NAME", "CATEGORY_NAME"]
-        metrics = ["TOTAL_QUANTITY_SOLD", "ORDER_COUNT"]
-        filters = None
-        
-    elif "high value" in question_lower or "expensive" in question_lower:
-        dimensions = ["CUSTOMER_NAME", "ORDER_DATE"]
-        metrics = ["TOTAL_REVENUE"]
-        filters = "high_value_orders"
-        
-    elif "recent" in question_lower or "last 30 days" in question_lower:
-        dimensions = ["PRODUCT_NAME", "ORDER_DATE"]
-        metrics = ["TOTAL_REVENUE", "TOTAL_QUANTITY_SOLD"]
-        filters = "recent_orders"
-        
-    else:
-        # Default query
-        dimensions = ["PRODUCT_NAME", "CUSTOMER_NAME"]
-        metrics = ["TOTAL_REVENUE", "ORDER_COUNT"]
-        filters = None
+    if intent.get("materialized_query"):
+        result, query = query_materialized_view(session, intent["materialized_query"])
+        if result is not None:
+            return result, query
     
-    return query_semantic_view(session, semantic_view, dimensions, metrics, filters)
+    return query_semantic_view(
+        session,
+        semantic_view,
+        intent["dimensions"],
+        intent["metrics"],
+        intent["filters"]
+    )
+
+# Charts are memoized on DataFrame content, so cap the rows that get hashed
+MAX_CHART_ROWS = 5000
 
-def create_visualization(df, chart_type="bar"):
+# Chart height is passed to Plotly Express directly so figures are built with
+# it rather than re-laid out after construction; the theme is left to Streamlit
+CHART_HEIGHT = 400
+
+@st.cache_data(show_spinner=False)
+def create_visualization(df, chart_type, numeric_cols, text_cols):
     """Create visualizations from query results"""
     if df.empty:
         return None
     
-    # Try to identify numeric columns for metrics
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    text_cols = df.select_dtypes(include=['object']).columns.tolist()
-    
     if not numeric_cols or not text_cols:
         return None
     
@@ -193,14 +342,16 @@ def create_visualization(df, chart_type="bar"):
             x=text_cols[0], 
             y=numeric_cols[0],
             title=f"{numeric_cols[0]} by {text_cols[0]}",
-            color=numeric_cols[0] if len(numeric_cols) > 0 else None
+            color=numeric_cols[0] if len(numeric_cols) > 0 else None,
+            height=CHART_HEIGHT
         )
     elif chart_type == "line":
         fig = px.line(
             df,
             x=text_cols[0],
             y=numeric_cols[0],
-            title=f"{numeric_cols[0]} over {text_cols[0]}"
+            title=f"{numeric_cols[0]} over {text_cols[0]}",
+            height=CHART_HEIGHT
         )
     else:  # scatter
         if len(numeric_cols) >= 2:
@@ -209,17 +360,11 @@ def create_visualization(df, chart_type="bar"):
                 x=numeric_cols[0],
                 y=numeric_cols[1],
                 color=text_cols[0] if text_cols else None,
-                title=f"{numeric_cols[1]} vs {numeric_cols[0]}"
+                title=f"{numeric_cols[1]} vs {numeric_cols[0]}",
+                height=CHART_HEIGHT
             )
         else:
-            fig = px.bar(df, x=text_cols[0], y=numeric_cols[0])
-    
-    fig.update_layout(
-        height=400,
-        showlegend=True,
-        xaxis_title=text_cols[0] if text_cols else "Category",
-        yaxis_title=numeric_cols[0] if numeric_cols else "Value"
-    )
+            fig = px.bar(df, x=text_cols[0], y=numeric_cols[0], height=CHART_HEIGHT)
     
     return fig
 
@@ -227,18 +372,14 @@ def main():
     """Main Streamlit app"""
     
     # Header
-    st.markdown('<h1 class="main-header">🤖 RDF Semantic Chat Assistant</h1>', unsafe_allow_html=True)
-    st.markdown("#### Powered by Snowflake Semantic Views & Cortex Analyst")
+    st.markdown(PAGE_HEADER_HTML, unsafe_allow_html=True)
     
     # Initialize session
-    if 'session' not in st.session_state:
-        st.session_state.session = initialize_session()
+    session = initialize_session()
     
-    if not st.session_state.session:
+    if not session:
         st.stop()
     
-    session = st.session_state.session
-    
     # Sidebar for semantic view information
     with st.sidebar:
         st.header("🎯 Semantic Views")
@@ -246,8 +387,15 @@ def main():
         # Get available semantic views
         semantic_views = get_semantic_views(session)
         
+        view_col, refresh_col = st.columns([5, 1])
+        refresh_col.button(
+            "↻",
+            help="Refresh semantic view metadata",
+            on_click=clear_metadata_cache
+        )
+        
         if semantic_views:
-            selected_view = st.selectbox(
+            selected_view = view_col.selectbox(
                 "Select Semantic View:",
                 semantic_views,
                 index=0 if semantic_views else None
@@ -256,15 +404,15 @@ def main():
             if selected_view:
                 st.markdown(f"**Current View:** `{selected_view}`")
                 
+                dimensions, metrics = get_view_schema(session, selected_view)
+                
                 # Show dimensions
                 with st.expander("📊 Available Dimensions"):
-                    dimensions = get_semantic_dimensions(session, selected_view)
                     for dim in dimensions:
                         st.write(f"• {dim}")
                 
                 # Show metrics
                 with st.expander("📈 Available Metrics"):
-                    metrics = get_semantic_metrics(session, selected_view)
                     for metric in metrics:
                         st.write(f"• {metric}")
                 
@@ -296,7 +444,7 @@ def main():
                                 limit=query_limit
                             )
                             
-                            if result:
+                            if result is not None:
                                 st.session_state.last_query_result = result
                                 st.session_state.last_query = query
                                 st.success("Query executed successfully!")
@@ -310,8 +458,10 @@ def main():
         st.header("💬 Natural Language Chat")
         
         # Sample questions
-        st.markdown('<div class="semantic-info">', unsafe_allow_html=True)
-        st.markdown("**Try asking questions like:**")
+        st.markdown(
+            '<div class="semantic-info"><strong>Try asking questions like:</strong></div>',
+            unsafe_allow_html=True
+        )
         sample_questions = [
             "What is our total revenue?",
             "Show me the top customers by value",
@@ -321,10 +471,15 @@ def main():
             "Which categories generate the most revenue?"
         ]
         
+        # on_click updates the question before the rerun, so the text input
+        # picks it up without needing a second rerun
+        sample_cols = st.columns(3)
         for i, question in enumerate(sample_questions):
-            if st.button(f"💡 {question}", key=f"sample_{i}"):
-                st.session_state.current_question = question
-        st.markdown('</div>', unsafe_allow_html=True)
+            sample_cols[i % 3].button(
+                f"💡 {question}",
+                key=f"sample_{i}",
+                on_click=lambda q=question: st.session_state.update(current_question=q)
+            )
         
         # Chat input
         user_question = st.text_input(
@@ -343,31 +498,27 @@ def main():
                         semantic_views[0]
                     )
                     
-                    if result and query:
+                    if result is not None and query:
                         # Display conversation
-                        st.markdown('<div class="chat-message user-message">', unsafe_allow_html=True)
-                        st.markdown(f"**You:** {user_question}")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        st.markdown('<div class="chat-message assistant-message">', unsafe_allow_html=True)
-                        st.markdown("**🤖 Cortex Analyst:** I found the data you requested!")
-                        st.markdown('</div>', unsafe_allow_html=True)
+                        st.markdown(
+                            '<div class="chat-message user-message">'
+                            f'<strong>You:</strong> {html.escape(user_question)}</div>'
+                            '<div class="chat-message assistant-message">'
+                            '<strong>🤖 Cortex Analyst:</strong> I found the data you requested!</div>',
+                            unsafe_allow_html=True
+                        )
                         
                         # Show query used
                         with st.expander("🔍 Generated SQL Query"):
                             st.code(query, language="sql")
                         
-                        # Convert result to DataFrame
-                        if result:
-                            df = pd.DataFrame([row.as_dict() for row in result])
-                            
-                            # Display results
-                            st.subheader("📊 Results")
-                            st.dataframe(df, use_container_width=True)
-                            
-                            # Store for visualization
-                            st.session_state.last_query_result = df
-                            st.session_state.last_question = user_question
+                        # Display results
+                        st.subheader("📊 Results")
+                        st.dataframe(result, use_container_width=True)
+                        
+                        # Store for visualization
+                        st.session_state.last_query_result = result
+                        st.session_state.last_question = user_question
             else:
                 st.error("No semantic views available. Please run the demo setup first.")
     
@@ -377,28 +528,33 @@ def main():
         if 'last_query_result' in st.session_state:
             df = st.session_state.last_query_result
             
-            if isinstance(df, list):  # Convert Snowpark result to DataFrame
-                df = pd.DataFrame([row.as_dict() for row in df])
-            
             if not df.empty:
+                # Identify numeric columns for metrics and text columns for
+                # categories once, for both the chart and the summary
+                numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+                text_cols = df.select_dtypes(include=['object']).columns.tolist()
+                
                 chart_type = st.selectbox(
                     "Chart Type:",
                     ["bar", "line", "scatter"],
                     index=0
                 )
                 
-                fig = create_visualization(df, chart_type)
+                fig = create_visualization(
+                    df.head(MAX_CHART_ROWS), chart_type, numeric_cols, text_cols
+                )
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Summary metrics
                 st.subheader("📋 Summary")
-                numeric_cols = df.select_dtypes(include=['number']).columns
                 
-                if len(numeric_cols) > 0:
-                    for col in numeric_cols[:3]:  # Show up to 3 metrics
-                        col_sum = df[col].sum()
-                        col_avg = df[col].mean()
+                if numeric_cols:
+                    # Compute sum and mean for up to 3 metrics in one vectorized call
+                    stats = df[numeric_cols[:3]].agg(['sum', 'mean'])
+                    for col in stats.columns:
+                        col_sum = stats.at['sum', col]
+                        col_avg = stats.at['mean', col]
                         
                         st.markdown(f"""
                         <div class="metric-card">
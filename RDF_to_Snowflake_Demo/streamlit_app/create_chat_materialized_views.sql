@@ -0,0 +1,53 @@
+-- OPTIONAL: Materialized Views for the RDF Semantic Chat Assistant
+-- Pre-aggregates the "top customers" and "best products" chat intents so the
+-- app does not aggregate the base tables on every ask.
+--
+-- Materialized views require Enterprise Edition or higher. The app works
+-- without them: it falls back to querying the semantic layer directly.
+-- Run this once, after deploy_streamlit_app.sql has created the app.
+
+-- Set the correct Snowflake context
+USE ROLE SYSADMIN;
+USE WAREHOUSE RDF_DEMO_WH;
+USE DATABASE RDF_SEMANTIC_DB;
+USE SCHEMA SEMANTIC_VIEWS;
+
+-- ================================================================
+-- STEP 1: CREATE MATERIALIZED VIEWS FOR COMMON CHAT QUESTIONS
+-- ================================================================
+
+SELECT '=== Creating Materialized Views for Chat Intents ===' as DEMO_STATUS;
+
+-- Snowflake materialized views cannot contain joins, so each view aggregates a
+-- single fact table and the app joins in the (small) dimension table for names.
+CREATE OR REPLACE MATERIALIZED VIEW MV_CUSTOMER_ORDER_TOTALS
+COMMENT = 'Per-customer order totals backing the top customers chat intent'
+AS
+SELECT 
+    CUSTOMERID,
+    SUM(TOTAL_AMOUNT) as CUSTOMER_LIFETIME_VALUE,
+    COUNT(ID) as TOTAL_ORDERS
+FROM ORDER_
+GROUP BY CUSTOMERID;
+
+CREATE OR REPLACE MATERIALIZED VIEW MV_PRODUCT_SALES_TOTALS
+COMMENT = 'Per-product sales totals backing the best products chat intent'
+AS
+SELECT 
+    PRODUCTID,
+    SUM(QUANTITY) as TOTAL_QUANTITY_SOLD,
+    COUNT(ORDERID) as ORDER_COUNT
+FROM ORDERITEM
+GROUP BY PRODUCTID;
+
+-- ================================================================
+-- STEP 2: GRANT APP ACCESS TO THE MATERIALIZED VIEWS
+-- ================================================================
+
+SELECT '=== Granting App Access to Materialized Views ===' as DEMO_STATUS;
+
+GRANT SELECT ON ALL MATERIALIZED VIEWS IN SCHEMA RDF_SEMANTIC_DB.SEMANTIC_VIEWS TO APPLICATION ROLE RDF_SEMANTIC_CHAT_APP_ROLE;
+
+SELECT 
+    '=== Chat Materialized Views Created ===' as COMPLETION_STATUS,
+    'Top customers and best products questions now read pre-aggregated totals' as APP_STATUS;
@@ -131,6 +131,14 @@ SELECT
     'What are our high-value orders?' as QUESTION_4,
     'Show me recent sales trends' as QUESTION_5;
 
+-- ================================================================
+-- OPTIONAL: MATERIALIZED VIEWS FOR COMMON CHAT QUESTIONS
+-- ================================================================
+
+-- On Enterprise Edition accounts, run create_chat_materialized_views.sql next
+-- to pre-aggregate the top customers and best products questions. The app
+-- falls back to the semantic views when those materialized views are absent.
+
 -- ================================================================
 -- COMPLETION STATUS
 -- ================================================================
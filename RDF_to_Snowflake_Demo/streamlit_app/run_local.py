@@ -4,27 +4,33 @@ Local Launcher for RDF Semantic Chat Assistant
 This script sets up the environment and runs the Streamlit app locally
 """
 
-import subprocess
+import importlib.util
 import sys
 import os
 from pathlib import Path
 
 def check_requirements():
     """Check if required packages are installed"""
-    required_packages = [
-        'streamlit',
-        'snowflake-snowpark-python',
-        'snowflake-connector-python',
-        'pandas',
-        'plotly'
-    ]
+    # Map pip package names to the modules they install
+    required_packages = {
+        'streamlit': 'streamlit',
+        'snowflake-snowpark-python': 'snowflake.snowpark',
+        'snowflake-connector-python': 'snowflake.connector',
+        'pandas': 'pandas',
+        'plotly': 'plotly'
+    }
     
     missing_packages = []
     
-    for package in required_packages:
+    for package, module in required_packages.items():
+        # find_spec locates the module without executing it, which avoids
+        # paying the import cost of pandas/plotly just to check for them
         try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
+            found = importlib.util.find_spec(module) is not None
+        except ImportError:  # Parent package (e.g. snowflake) is missing
+            found = False
+        
+        if not found:
             missing_packages.append(package)
     
     if missing_packages:
@@ -97,22 +103,25 @@ def run_streamlit():
     print()
     
     try:
-        # Run streamlit
-        cmd = [sys.executable, '-m', 'streamlit', 'run', str(app_file)]
-        subprocess.run(cmd, check=True)
+        # Run streamlit in this process rather than spawning a new interpreter
+        from streamlit.web import bootstrap
+        
+        bootstrap.load_config_options(flag_options={})
+        bootstrap.run(str(app_file), False, [], flag_options={})
+        return True
         
     except KeyboardInterrupt:
         print("\n👋 Streamlit app stopped")
         return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running Streamlit: {e}")
-        return False
     
-    except FileNotFoundError:
+    except ImportError:
         print("❌ Streamlit not found. Install it with:")
         print("   pip install streamlit")
         return False
+        
+    except Exception as e:
+        print(f"❌ Error running Streamlit: {e}")
+        return False
 
 def main():
     """Main function"""
@@ -4,14 +4,127 @@ Comprehensive Validation Script for RDF to Snowflake Semantic Views Demo
 This script validates all SQL scripts for consistency, syntax, and integration issues.
 """
 
+import mmap
 import os
 import re
+from bisect import bisect_left
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
-@dataclass
+# Known UDF functions to look for
+UDF_FUNCTIONS = [
+    'PARSE_RDF_SCHEMA', 'GENERATE_SEMANTIC_VIEW_DDL', 
+    'LOAD_RDF_DATA', 'GENERATE_SNOWFLAKE_SEMANTIC_VIEW',
+    'GENERATE_ID'
+]
+
+# Patterns are compiled once at import rather than looked up per file
+_FUNCTION_DEF_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(\w+)\s*\(([^)]*)\)',
+    re.IGNORECASE
+)
+
+# Call arguments with up to one level of nested parentheses, e.g. f(a, g(b));
+# deeper nesting falls back to everything up to the first ')'
+_CALL_ARGS = r'((?:[^()]*(?:\([^()]*\)[^()]*)*(?=\))|[^)]*))'
+
+# One alternation over every UDF name, so each file is scanned once for calls.
+# Every alternative is its own (call(params)) group pair; the call group closes
+# last, so match.lastindex identifies the UDF and lastindex + 1 holds its params
+_UDF_CALL_RE = re.compile(
+    "|".join(rf'({name}\s*\({_CALL_ARGS}\))' for name in UDF_FUNCTIONS),
+    re.IGNORECASE
+)
+_UDF_CALL_GROUP_NAMES = [None] + [name for name in UDF_FUNCTIONS for _ in range(2)]
+
+_USE_RES = {
+    context_type: re.compile(pattern, re.IGNORECASE)
+    for context_type, pattern in {
+        'ROLE': r'USE\s+ROLE\s+(\w+)',
+        'WAREHOUSE': r'USE\s+WAREHOUSE\s+(\w+)',
+        'DATABASE': r'USE\s+DATABASE\s+(\w+)',
+        'SCHEMA': r'USE\s+SCHEMA\s+(\w+)'
+    }.items()
+}
+
+# Each check pairs a keyword every match must contain with its pattern, so
+# files without the keyword can skip the regex entirely
+_SYNTAX_RES = {
+    'COMMENT_SYNTAX': ('COMMENT', re.compile(r'(?:CREATE|ALTER).*COMMENT\s+["\'][^=]', re.IGNORECASE)),  # Should be COMMENT = 'text'
+    'UUID_IN_VALUES': ('UUID_STRING', re.compile(r'VALUES\s*\([^)]*UUID_STRING\(\)', re.IGNORECASE)),  # Should use SELECT
+}
+
+# Files above this size are decoded straight from a memory map rather than
+# first being read into an intermediate bytes object
+_MMAP_THRESHOLD = 256 * 1024
+
+def _read_sql_text(sql_file: Path) -> str:
+    """Read a SQL file as UTF-8 text with universal newlines, like Path.read_text"""
+    if sql_file.stat().st_size <= _MMAP_THRESHOLD:
+        return sql_file.read_text(encoding='utf-8')
+    
+    with open(sql_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        content = str(mm, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def _line_index(content: str) -> List[int]:
+    """Return the offset of every newline in content, in ascending order"""
+    newlines = []
+    pos = content.find('\n')
+    while pos != -1:
+        newlines.append(pos)
+        pos = content.find('\n', pos + 1)
+    return newlines
+
+def _line_number(newlines: List[int], offset: int) -> int:
+    """Return the 1-based line number of offset using a _line_index result"""
+    # Number of newlines before offset, found by binary search instead of
+    # re-counting the content up to every match
+    return bisect_left(newlines, offset) + 1
+
+# Structural characters for splitting parameter lists. Definitions only
+# track parentheses; calls also skip over quoted literals.
+_DEF_PARAM_DELIM_RE = re.compile(r'[(),]')
+_CALL_PARAM_DELIM_RE = re.compile(r'[(),"\']')
+
+def _split_top_level(params_str: str, delim_re) -> List[str]:
+    """Split params_str on commas outside parentheses and quotes"""
+    # The regex jumps straight from one structural character to the next, so
+    # the text in between never goes through the Python loop
+    params = []
+    start = 0
+    paren_depth = 0
+    quote_char = None
+    
+    for match in delim_re.finditer(params_str):
+        char = match.group()
+        if quote_char:
+            if char == quote_char:
+                quote_char = None
+        elif char in ('"', "'"):
+            quote_char = char
+        elif char == '(':
+            paren_depth += 1
+        elif char == ')':
+            paren_depth -= 1
+        elif paren_depth == 0:
+            params.append(params_str[start:match.start()].strip())
+            start = match.end()
+    
+    params.append(params_str[start:].strip())
+    
+    return [p for p in params if p]
+
+# Slotted records drop the per-instance __dict__; slots=True needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FunctionDefinition:
     name: str
     parameters: List[str]
@@ -19,7 +132,7 @@ class FunctionDefinition:
     line_number: int
     full_signature: str
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FunctionCall:
     name: str
     parameters: List[str]
@@ -27,7 +140,7 @@ class FunctionCall:
     line_number: int
     full_call: str
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ValidationIssue:
     severity: str  # 'ERROR', 'WARNING', 'INFO'
     category: str
@@ -41,8 +154,14 @@ class SQLValidator:
         self.demo_root = Path(demo_root)
         self.issues: List[ValidationIssue] = []
         self.function_definitions: Dict[str, FunctionDefinition] = {}
-        self.function_calls: List[FunctionCall] = []
+        self.function_calls_by_name: Dict[str, List[FunctionCall]] = defaultdict(list)
         self.context_settings: Dict[str, Dict[str, str]] = {}
+        # File contents (as read and upper-cased) and newline indexes, read
+        # once while parsing and shared by the later validation passes and by
+        # other tools that run the validator in-process
+        self.file_cache: Dict[Path, Tuple[str, str, List[int]]] = {}
+        self._sql_files_cache: List[Path] = None
+        self._files_parsed = False
         
     def validate_all(self) -> List[ValidationIssue]:
         """Run all validation checks"""
@@ -53,8 +172,7 @@ class SQLValidator:
         print(f"📁 Found {len(sql_files)} SQL files to validate")
         
         # Step 1: Parse all files
-        for sql_file in sql_files:
-            self._parse_sql_file(sql_file)
+        self.parse_files()
         
         # Step 2: Run validation checks
         self._validate_function_signatures()
@@ -68,29 +186,49 @@ class SQLValidator:
         
         return self.issues
     
+    def parse_files(self):
+        """Parse every SQL file once, filling file_cache; later calls are no-ops"""
+        if self._files_parsed:
+            return
+        self._files_parsed = True
+        
+        # Parse concurrently, then merge in sorted file order so definitions,
+        # calls and issues come out the same on every run
+        sql_files = self._find_sql_files()
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(self._parse_sql_file, f) for f in sql_files]
+            for sql_file, future in zip(sql_files, futures):
+                self._merge_parsed_file(sql_file, future)
+    
     def _find_sql_files(self) -> List[Path]:
         """Find all SQL files in the demo"""
-        sql_files = []
-        for pattern in ['**/*.sql']:
-            sql_files.extend(self.demo_root.glob(pattern))
-        return sorted(sql_files)
+        if self._sql_files_cache is None:
+            sql_files = []
+            for root, _, files in os.walk(self.demo_root):
+                sql_files.extend(Path(root) / f for f in files if f.endswith('.sql'))
+            self._sql_files_cache = sorted(sql_files)
+        return self._sql_files_cache
     
-    def _parse_sql_file(self, sql_file: Path):
+    def _parse_sql_file(self, sql_file: Path) -> Tuple[str, str, List[int], List[FunctionDefinition],
+                                                      List[FunctionCall], Dict[str, str]]:
         """Parse a SQL file to extract functions, calls, and context"""
+        content = _read_sql_text(sql_file)
+        content_upper = content.upper()
+        newlines = _line_index(content)
+        
+        return (
+            content,
+            content_upper,
+            newlines,
+            self._extract_function_definitions(sql_file, content, content_upper, newlines),
+            self._extract_function_calls(sql_file, content, content_upper, newlines),
+            self._extract_context_settings(content, content_upper),
+        )
+    
+    def _merge_parsed_file(self, sql_file: Path, future):
+        """Fold one file's parse results into the validator state"""
         try:
-            with open(sql_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-            
-            # Extract function definitions
-            self._extract_function_definitions(sql_file, content, lines)
-            
-            # Extract function calls
-            self._extract_function_calls(sql_file, content, lines)
-            
-            # Extract context settings
-            self._extract_context_settings(sql_file, content, lines)
-            
+            content, content_upper, newlines, definitions, calls, context = future.result()
         except Exception as e:
             self.issues.append(ValidationIssue(
                 severity='ERROR',
@@ -99,80 +237,99 @@ class SQLValidator:
                 line_number=0,
                 description=f"Failed to parse file: {e}"
             ))
+            return
+        
+        self.file_cache[sql_file] = (content, content_upper, newlines)
+        for func_def in definitions:
+            self.function_definitions[func_def.name] = func_def
+        for func_call in calls:
+            self.function_calls_by_name[func_call.name].append(func_call)
+        self.context_settings[str(sql_file)] = context
     
-    def _extract_function_definitions(self, sql_file: Path, content: str, lines: List[str]):
+    def _extract_function_definitions(self, sql_file: Path, content: str, content_upper: str,
+                                      newlines: List[int]) -> List[FunctionDefinition]:
         """Extract CREATE FUNCTION definitions"""
-        # Pattern for function definitions
-        function_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(\w+)\s*\((.*?)\)'
-        
-        for match in re.finditer(function_pattern, content, re.IGNORECASE | re.DOTALL):
-            func_name = match.group(1).upper()
-            params_str = match.group(2)
+        definitions = []
+        if 'FUNCTION' not in content_upper:
+            return definitions
+        
+        pos = 0
+        while True:
+            match = _FUNCTION_DEF_RE.search(content, pos)
+            if not match:
+                break
+            # Pull out the fields we need so the match object can be dropped
+            func_name, params_str, full_signature = match.group(1, 2, 0)
+            start, pos = match.span()
             
             # Find line number
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = _line_number(newlines, start)
             
             # Parse parameters
             parameters = self._parse_parameters(params_str)
             
             func_def = FunctionDefinition(
-                name=func_name,
+                name=func_name.upper(),
                 parameters=parameters,
                 file_path=str(sql_file),
                 line_number=line_num,
-                full_signature=match.group(0)
+                full_signature=full_signature
             )
             
-            self.function_definitions[func_name] = func_def
+            definitions.append(func_def)
+        
+        return definitions
     
-    def _extract_function_calls(self, sql_file: Path, content: str, lines: List[str]):
+    def _extract_function_calls(self, sql_file: Path, content: str, content_upper: str,
+                                newlines: List[int]) -> List[FunctionCall]:
         """Extract function calls"""
-        # Known UDF functions to look for
-        udf_functions = [
-            'PARSE_RDF_SCHEMA', 'GENERATE_SEMANTIC_VIEW_DDL', 
-            'LOAD_RDF_DATA', 'GENERATE_SNOWFLAKE_SEMANTIC_VIEW',
-            'GENERATE_ID'
-        ]
-        
-        for func_name in udf_functions:
-            # Pattern for function calls
-            call_pattern = rf'{func_name}\s*\((.*?)\)'
+        calls = []
+        if not any(name in content_upper for name in UDF_FUNCTIONS):
+            return calls
+        
+        pos = 0
+        while True:
+            match = _UDF_CALL_RE.search(content, pos)
+            if not match:
+                break
+            call_group = match.lastindex
+            func_name = _UDF_CALL_GROUP_NAMES[call_group]
+            params_str, full_call = match.group(call_group + 1, 0)
+            start = match.start()
+            # Resume inside the argument list so UDF calls nested in another
+            # call's arguments are still found
+            pos = start + len(func_name)
             
-            for match in re.finditer(call_pattern, content, re.IGNORECASE | re.DOTALL):
-                params_str = match.group(1)
-                line_num = content[:match.start()].count('\n') + 1
-                
-                # Parse parameters (simplified)
-                parameters = self._parse_call_parameters(params_str)
-                
-                func_call = FunctionCall(
-                    name=func_name.upper(),
-                    parameters=parameters,
-                    file_path=str(sql_file),
-                    line_number=line_num,
-                    full_call=match.group(0)
-                )
-                
-                self.function_calls.append(func_call)
+            line_num = _line_number(newlines, start)
+            
+            # Parse parameters (simplified)
+            parameters = self._parse_call_parameters(params_str)
+            
+            func_call = FunctionCall(
+                name=func_name,
+                parameters=parameters,
+                file_path=str(sql_file),
+                line_number=line_num,
+                full_call=full_call
+            )
+            
+            calls.append(func_call)
+        
+        return calls
     
-    def _extract_context_settings(self, sql_file: Path, content: str, lines: List[str]):
+    def _extract_context_settings(self, content: str, content_upper: str) -> Dict[str, str]:
         """Extract USE statements for context"""
         context = {}
+        if 'USE' not in content_upper:
+            return context
         
         # Extract USE statements
-        use_patterns = {
-            'ROLE': r'USE\s+ROLE\s+(\w+)',
-            'WAREHOUSE': r'USE\s+WAREHOUSE\s+(\w+)',
-            'DATABASE': r'USE\s+DATABASE\s+(\w+)',
-            'SCHEMA': r'USE\s+SCHEMA\s+(\w+)'
-        }
-        
-        for context_type, pattern in use_patterns.items():
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for context_type, use_re in _USE_RES.items():
+            matches = use_re.findall(content)
             if matches:
                 context[context_type] = matches[-1]  # Take the last one
         
-        self.context_settings[str(sql_file)] = context
+        return context
     
     def _parse_parameters(self, params_str: str) -> List[str]:
         """Parse function definition parameters"""
@@ -180,89 +337,49 @@ class SQLValidator:
             return []
         
         # Simple parameter parsing (ignores DEFAULT values for counting)
-        params = []
-        current_param = ""
-        paren_depth = 0
-        
-        for char in params_str:
-            if char == '(':
-                paren_depth += 1
-            elif char == ')':
-                paren_depth -= 1
-            elif char == ',' and paren_depth == 0:
-                params.append(current_param.strip())
-                current_param = ""
-                continue
-            
-            current_param += char
+        params = _split_top_level(params_str, _DEF_PARAM_DELIM_RE)
         
-        if current_param.strip():
-            params.append(current_param.strip())
-        
-        return [p.split()[0] for p in params if p.strip()]  # Extract parameter names
+        return [p.split()[0] for p in params]  # Extract parameter names
     
     def _parse_call_parameters(self, params_str: str) -> List[str]:
         """Parse function call parameters (simplified)"""
         if not params_str.strip():
             return []
         
-        # Count parameters by commas (ignoring nested calls)
-        params = []
-        current_param = ""
-        paren_depth = 0
-        quote_char = None
-        
-        for char in params_str:
-            if quote_char:
-                if char == quote_char:
-                    quote_char = None
-            elif char in ['"', "'"]:
-                quote_char = char
-            elif char == '(':
-                paren_depth += 1
-            elif char == ')':
-                paren_depth -= 1
-            elif char == ',' and paren_depth == 0 and not quote_char:
-                params.append(current_param.strip())
-                current_param = ""
-                continue
-            
-            current_param += char
-        
-        if current_param.strip():
-            params.append(current_param.strip())
-        
-        return [p for p in params if p.strip()]
+        # Count parameters by commas (ignoring nested calls and quoted text)
+        return _split_top_level(params_str, _CALL_PARAM_DELIM_RE)
     
     def _validate_function_signatures(self):
         """Validate function calls match definitions"""
         print("🔍 Validating function signatures...")
         
-        for call in self.function_calls:
-            if call.name not in self.function_definitions:
-                self.issues.append(ValidationIssue(
-                    severity='ERROR',
-                    category='UNDEFINED_FUNCTION',
-                    file_path=call.file_path,
-                    line_number=call.line_number,
-                    description=f"Function '{call.name}' is called but not defined",
-                    suggestion="Ensure the function is created before calling it"
-                ))
-                continue
-            
-            definition = self.function_definitions[call.name]
-            expected_params = len(definition.parameters)
-            actual_params = len(call.parameters)
+        for name, calls in self.function_calls_by_name.items():
+            definition = self.function_definitions.get(name)
             
-            if actual_params != expected_params:
-                self.issues.append(ValidationIssue(
-                    severity='ERROR',
-                    category='PARAMETER_MISMATCH',
-                    file_path=call.file_path,
-                    line_number=call.line_number,
-                    description=f"Function '{call.name}' expects {expected_params} parameters but got {actual_params}",
-                    suggestion=f"Expected parameters: {', '.join(definition.parameters)}"
-                ))
+            for call in calls:
+                if definition is None:
+                    self.issues.append(ValidationIssue(
+                        severity='ERROR',
+                        category='UNDEFINED_FUNCTION',
+                        file_path=call.file_path,
+                        line_number=call.line_number,
+                        description=f"Function '{call.name}' is called but not defined",
+                        suggestion="Ensure the function is created before calling it"
+                    ))
+                    continue
+                
+                expected_params = len(definition.parameters)
+                actual_params = len(call.parameters)
+                
+                if actual_params != expected_params:
+                    self.issues.append(ValidationIssue(
+                        severity='ERROR',
+                        category='PARAMETER_MISMATCH',
+                        file_path=call.file_path,
+                        line_number=call.line_number,
+                        description=f"Function '{call.name}' expects {expected_params} parameters but got {actual_params}",
+                        suggestion=f"Expected parameters: {', '.join(definition.parameters)}"
+                    ))
     
     def _validate_context_consistency(self):
         """Validate context settings are consistent"""
@@ -323,41 +440,37 @@ class SQLValidator:
         """Validate common SQL syntax patterns"""
         print("🔍 Validating syntax patterns...")
         
-        # Check for common syntax issues
-        syntax_checks = {
-            'COMMENT_SYNTAX': r'(?:CREATE|ALTER).*COMMENT\s+["\'][^=]',  # Should be COMMENT = 'text'
-            'UUID_IN_VALUES': r'VALUES\s*\([^)]*UUID_STRING\(\)',  # Should use SELECT
-        }
-        
-        for sql_file in self._find_sql_files():
-            try:
-                with open(sql_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                for check_name, pattern in syntax_checks.items():
-                    for match in re.finditer(pattern, content, re.IGNORECASE):
-                        line_num = content[:match.start()].count('\n') + 1
-                        
-                        if check_name == 'COMMENT_SYNTAX':
-                            self.issues.append(ValidationIssue(
-                                severity='ERROR',
-                                category='SYNTAX_ERROR',
-                                file_path=str(sql_file),
-                                line_number=line_num,
-                                description="Incorrect COMMENT syntax",
-                                suggestion="Use 'COMMENT = \"text\"' instead of 'COMMENT \"text\"'"
-                            ))
-                        elif check_name == 'UUID_IN_VALUES':
-                            self.issues.append(ValidationIssue(
-                                severity='ERROR',
-                                category='SYNTAX_ERROR',
-                                file_path=str(sql_file),
-                                line_number=line_num,
-                                description="UUID_STRING() function call in VALUES clause",
-                                suggestion="Use SELECT statement instead of VALUES for function calls"
-                            ))
-            except Exception as e:
-                continue
+        for sql_file, (content, content_upper, newlines) in self.file_cache.items():
+            # Check for common syntax issues
+            for check_name, (keyword, syntax_re) in _SYNTAX_RES.items():
+                if keyword not in content_upper:
+                    continue
+                pos = 0
+                while True:
+                    match = syntax_re.search(content, pos)
+                    if not match:
+                        break
+                    start, pos = match.span()
+                    line_num = _line_number(newlines, start)
+                    
+                    if check_name == 'COMMENT_SYNTAX':
+                        self.issues.append(ValidationIssue(
+                            severity='ERROR',
+                            category='SYNTAX_ERROR',
+                            file_path=str(sql_file),
+                            line_number=line_num,
+                            description="Incorrect COMMENT syntax",
+                            suggestion="Use 'COMMENT = \"text\"' instead of 'COMMENT \"text\"'"
+                        ))
+                    elif check_name == 'UUID_IN_VALUES':
+                        self.issues.append(ValidationIssue(
+                            severity='ERROR',
+                            category='SYNTAX_ERROR',
+                            file_path=str(sql_file),
+                            line_number=line_num,
+                            description="UUID_STRING() function call in VALUES clause",
+                            suggestion="Use SELECT statement instead of VALUES for function calls"
+                        ))
     
     def _validate_warehouse_usage(self):
         """Validate warehouse creation and usage"""
@@ -367,15 +480,15 @@ class SQLValidator:
         warehouse_created = False
         warehouse_used = False
         
-        for file_path, context in self.context_settings.items():
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            if 'CREATE WAREHOUSE' in content.upper():
+        for _, content_upper, _ in self.file_cache.values():
+            if not warehouse_created and 'CREATE WAREHOUSE' in content_upper:
                 warehouse_created = True
             
-            if 'USE WAREHOUSE' in content.upper():
+            if not warehouse_used and 'USE WAREHOUSE' in content_upper:
                 warehouse_used = True
+            
+            if warehouse_created and warehouse_used:
+                break
         
         if warehouse_used and not warehouse_created:
             self.issues.append(ValidationIssue(
@@ -389,51 +502,57 @@ class SQLValidator:
     
     def _generate_report(self):
         """Generate validation report"""
-        print("\n" + "="*80)
-        print("🔍 COMPREHENSIVE VALIDATION REPORT")
-        print("="*80)
+        lines = [
+            "\n" + "="*80,
+            "🔍 COMPREHENSIVE VALIDATION REPORT",
+            "="*80,
+        ]
         
         if not self.issues:
-            print("✅ ALL VALIDATIONS PASSED - NO ISSUES FOUND!")
+            lines.append("✅ ALL VALIDATIONS PASSED - NO ISSUES FOUND!")
+            sys.stdout.write("\n".join(lines) + "\n")
             return
         
-        # Group issues by severity
-        errors = [i for i in self.issues if i.severity == 'ERROR']
-        warnings = [i for i in self.issues if i.severity == 'WARNING']
-        info = [i for i in self.issues if i.severity == 'INFO']
+        # Group issues by severity in a single pass
+        by_severity = defaultdict(list)
+        for issue in self.issues:
+            by_severity[issue.severity].append(issue)
         
-        print(f"📊 SUMMARY: {len(errors)} Errors, {len(warnings)} Warnings, {len(info)} Info")
+        lines.append(f"📊 SUMMARY: {len(by_severity['ERROR'])} Errors, {len(by_severity['WARNING'])} Warnings, "
+                     f"{len(by_severity['INFO'])} Info")
         
-        for severity, issues in [('ERROR', errors), ('WARNING', warnings), ('INFO', info)]:
+        for severity in ('ERROR', 'WARNING', 'INFO'):
+            issues = by_severity[severity]
             if not issues:
                 continue
                 
-            print(f"\n🔴 {severity}S ({len(issues)}):")
-            print("-" * 50)
+            lines.append(f"\n🔴 {severity}S ({len(issues)}):")
+            lines.append("-" * 50)
             
             for issue in issues:
-                print(f"📁 File: {issue.file_path}")
-                print(f"📍 Line: {issue.line_number}")
-                print(f"🏷️  Category: {issue.category}")
-                print(f"📝 Description: {issue.description}")
+                lines.append(f"📁 File: {issue.file_path}")
+                lines.append(f"📍 Line: {issue.line_number}")
+                lines.append(f"🏷️  Category: {issue.category}")
+                lines.append(f"📝 Description: {issue.description}")
                 if issue.suggestion:
-                    print(f"💡 Suggestion: {issue.suggestion}")
-                print()
+                    lines.append(f"💡 Suggestion: {issue.suggestion}")
+                lines.append("")
         
-        print("="*80)
+        lines.append("="*80)
         
-        # Print function definitions summary
-        print(f"\n📋 FUNCTION DEFINITIONS FOUND ({len(self.function_definitions)}):")
+        # Function definitions summary
+        lines.append(f"\n📋 FUNCTION DEFINITIONS FOUND ({len(self.function_definitions)}):")
         for name, func_def in self.function_definitions.items():
-            print(f"  {name}: {len(func_def.parameters)} parameters")
+            lines.append(f"  {name}: {len(func_def.parameters)} parameters")
         
-        # Print function calls summary
-        print(f"\n📞 FUNCTION CALLS FOUND ({len(self.function_calls)}):")
-        call_counts = {}
-        for call in self.function_calls:
-            call_counts[call.name] = call_counts.get(call.name, 0) + 1
+        # Function calls summary
+        call_counts = {name: len(calls) for name, calls in self.function_calls_by_name.items()}
+        lines.append(f"\n📞 FUNCTION CALLS FOUND ({sum(call_counts.values())}):")
         for name, count in call_counts.items():
-            print(f"  {name}: {count} calls")
+            lines.append(f"  {name}: {count} calls")
+        
+        # Emit the whole report with one write instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -448,7 +567,7 @@ def main():
     issues = validator.validate_all()
     
     # Return exit code based on issues
-    error_count = len([i for i in issues if i.severity == 'ERROR'])
+    error_count = sum(1 for i in issues if i.severity == 'ERROR')
     sys.exit(error_count)
 
 if __name__ == "__main__":
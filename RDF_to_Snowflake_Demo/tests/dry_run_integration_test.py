@@ -4,16 +4,47 @@ Dry Run Integration Test for RDF to Snowflake Semantic Views Demo
 This script validates the complete demo workflow without requiring Snowflake connection
 """
 
+import contextlib
+import io
 import os
 import re
 import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Tuple
-import subprocess
+from typing import List, Dict, Tuple, Set, FrozenSet, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comprehensive_validation import SQLValidator
+
+# Captures the object type and name of every CREATE statement in one sweep
+_CREATE_OBJ_RE = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?(TABLE|VIEW|SEMANTIC\s+VIEW|DATABASE|SCHEMA|WAREHOUSE)\s+(\w+)',
+    re.IGNORECASE
+)
+
+# Context statements every UDF script is expected to set
+_REQUIRED_CONTEXTS = ('USE DATABASE', 'USE SCHEMA')
+
+# Objects the demo scripts must create
+_REQUIRED_TABLES = frozenset({
+    'RDF_SCHEMAS', 'CONVERSION_RESULTS', 'PRODUCT', 'CATEGORY',
+    'CUSTOMER', 'ORDER_', 'SUPPLIER', 'ORDERITEM'
+})
+_REQUIRED_VIEWS = frozenset({
+    'SV_PRODUCT', 'SV_CATEGORY', 'SV_CUSTOMER', 'SV_ORDER',
+    'SV_SUPPLIER', 'SV_ORDERITEM', 'SV_PRODUCT_METRICS',
+    'SV_ORDER_METRICS', 'SV_CUSTOMER_METRICS'
+})
+_REQUIRED_SEMANTIC_VIEWS = frozenset({
+    'ECOMMERCE_SEMANTIC_MODEL', 'PRODUCT_ANALYTICS_MODEL',
+    'CUSTOMER_ANALYTICS_MODEL'
+})
 
 class DryRunIntegrationTest:
-    def __init__(self, demo_root: str):
+    def __init__(self, demo_root: str, validator: Optional[SQLValidator] = None):
         self.demo_root = Path(demo_root)
+        # The validator's file cache is the single read of the demo's SQL files
+        self.validator = validator if validator is not None else SQLValidator(demo_root)
         self.issues = []
         self.success = True
         
@@ -47,23 +78,19 @@ class DryRunIntegrationTest:
         print("\n🔍 TESTING SQL SYNTAX VALIDATION")
         print("-" * 40)
         
-        sql_files = list(self.demo_root.glob("**/*.sql"))
-        
-        for sql_file in sql_files:
+        for sql_file, (content, _, _) in self._read_sql_files().items():
             print(f"📄 Checking: {sql_file.name}")
             
-            try:
-                with open(sql_file, 'r') as f:
-                    content = f.read()
-                
-                # Basic syntax checks
-                self._check_basic_sql_syntax(sql_file, content)
-                
-            except Exception as e:
-                self._add_issue("ERROR", f"Failed to read {sql_file}: {e}")
+            # Basic syntax checks
+            self._check_basic_sql_syntax(sql_file, content)
         
         print("✅ SQL syntax validation completed")
     
+    def _read_sql_files(self) -> Dict[Path, Tuple[str, str, List[int]]]:
+        """Return the validator's cached SQL file contents, reading them on first use"""
+        self.validator.parse_files()
+        return self.validator.file_cache
+    
     def _check_basic_sql_syntax(self, sql_file: Path, content: str):
         """Perform basic SQL syntax validation"""
         
@@ -117,14 +144,15 @@ class DryRunIntegrationTest:
     
     def _validate_script_dependencies(self, script_path: Path):
         """Validate that script dependencies are met"""
-        with open(script_path, 'r') as f:
-            content = f.read()
+        cached = self._read_sql_files().get(script_path)
+        if cached is None:
+            return
         
         # Check for required context settings
-        required_contexts = ['USE DATABASE', 'USE SCHEMA']
+        _, content_upper, _ = cached
         
-        for context in required_contexts:
-            if context not in content.upper():
+        for context in _REQUIRED_CONTEXTS:
+            if context not in content_upper:
                 if 'python_udfs' in str(script_path):
                     self._add_issue("INFO", f"{script_path.name}: Missing {context} (should be set)")
     
@@ -133,19 +161,21 @@ class DryRunIntegrationTest:
         print("\n🔧 TESTING UDF CONSISTENCY")
         print("-" * 40)
         
-        # Run the comprehensive validation we built earlier
+        # Run the comprehensive validation we built earlier, in-process and
+        # with its own report silenced
         try:
-            result = subprocess.run([
-                sys.executable, 
-                str(self.demo_root / "tests/comprehensive_validation.py")
-            ], capture_output=True, text=True, cwd=self.demo_root)
+            with contextlib.redirect_stdout(io.StringIO()):
+                issues = self.validator.validate_all()
+            error_count = sum(1 for i in issues if i.severity == 'ERROR')
             
-            if result.returncode == 0:
+            if error_count == 0:
                 print("✅ All UDF consistency checks passed")
             else:
-                print("❌ UDF consistency issues found:")
-                print(result.stdout)
-                self._add_issue("ERROR", "UDF consistency validation failed")
+                print(f"❌ UDF consistency issues found: {error_count}")
+                for issue in issues:
+                    if issue.severity == 'ERROR':
+                        self._add_issue("ERROR", f"{Path(issue.file_path).name}:{issue.line_number}: "
+                                                 f"{issue.description}")
                 
         except Exception as e:
             self._add_issue("WARNING", f"Could not run UDF validation: {e}")
@@ -157,72 +187,42 @@ class DryRunIntegrationTest:
         print("\n📊 TESTING DATA FLOW INTEGRITY")
         print("-" * 40)
         
-        # Check that all required tables are created
-        required_tables = [
-            'RDF_SCHEMAS', 'CONVERSION_RESULTS', 'PRODUCT', 'CATEGORY', 
-            'CUSTOMER', 'ORDER_', 'SUPPLIER', 'ORDERITEM'
-        ]
+        created = self._find_created_objects()
         
-        # Check that all standard views are created  
-        required_views = [
-            'SV_PRODUCT', 'SV_CATEGORY', 'SV_CUSTOMER', 'SV_ORDER',
-            'SV_SUPPLIER', 'SV_ORDERITEM', 'SV_PRODUCT_METRICS',
-            'SV_ORDER_METRICS', 'SV_CUSTOMER_METRICS'
-        ]
+        # Check that all required tables, standard views and Snowflake
+        # Semantic Views are created
+        self._check_object_creation(_REQUIRED_TABLES, "TABLE", created.get("TABLE", set()))
+        self._check_object_creation(_REQUIRED_VIEWS, "VIEW", created.get("VIEW", set()))
+        self._check_semantic_view_creation(_REQUIRED_SEMANTIC_VIEWS, created.get("SEMANTIC VIEW", set()))
         
-        # Check that Snowflake Semantic Views are created
-        required_semantic_views = [
-            'ECOMMERCE_SEMANTIC_MODEL', 'PRODUCT_ANALYTICS_MODEL', 
-            'CUSTOMER_ANALYTICS_MODEL'
-        ]
+        print("✅ Data flow integrity validation completed")
+    
+    def _find_created_objects(self) -> Dict[str, Set[str]]:
+        """Collect the names of created objects in all scripts, grouped by object type"""
+        created: Dict[str, Set[str]] = {}
         
-        self._check_object_creation(required_tables, "TABLE")
-        self._check_object_creation(required_views, "VIEW")
-        self._check_semantic_view_creation(required_semantic_views)
+        for content, _, _ in self._read_sql_files().values():
+            for object_type, name in _CREATE_OBJ_RE.findall(content):
+                object_type = ' '.join(object_type.upper().split())
+                created.setdefault(object_type, set()).add(name.upper())
         
-        print("✅ Data flow integrity validation completed")
+        return created
     
-    def _check_object_creation(self, object_names: List[str], object_type: str):
+    def _check_object_creation(self, object_names: FrozenSet[str], object_type: str, created_objects: Set[str]):
         """Check that required database objects are created"""
         
-        sql_files = list(self.demo_root.glob("**/*.sql"))
-        created_objects = set()
-        
-        for sql_file in sql_files:
-            with open(sql_file, 'r') as f:
-                content = f.read()
-            
-            # Find CREATE TABLE/VIEW statements
-            pattern = rf'CREATE\s+(?:OR\s+REPLACE\s+)?{object_type}\s+(\w+)'
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            created_objects.update([match.upper() for match in matches])
-        
-        for obj_name in object_names:
-            if obj_name.upper() in created_objects:
-                print(f"  ✅ {object_type} {obj_name}")
-            else:
-                self._add_issue("WARNING", f"Required {object_type} {obj_name} not found in scripts")
+        for obj_name in sorted(object_names & created_objects):
+            print(f"  ✅ {object_type} {obj_name}")
+        for obj_name in sorted(object_names - created_objects):
+            self._add_issue("WARNING", f"Required {object_type} {obj_name} not found in scripts")
     
-    def _check_semantic_view_creation(self, semantic_view_names: List[str]):
+    def _check_semantic_view_creation(self, semantic_view_names: FrozenSet[str], created_semantic_views: Set[str]):
         """Check that required Snowflake Semantic Views are created"""
         
-        sql_files = list(self.demo_root.glob("**/*.sql"))
-        created_semantic_views = set()
-        
-        for sql_file in sql_files:
-            with open(sql_file, 'r') as f:
-                content = f.read()
-            
-            # Find CREATE SEMANTIC VIEW statements
-            pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?SEMANTIC\s+VIEW\s+(\w+)'
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            created_semantic_views.update([match.upper() for match in matches])
-        
-        for sv_name in semantic_view_names:
-            if sv_name.upper() in created_semantic_views:
-                print(f"  ✅ SEMANTIC VIEW {sv_name}")
-            else:
-                self._add_issue("ERROR", f"Required SEMANTIC VIEW {sv_name} not found in scripts")
+        for sv_name in sorted(semantic_view_names & created_semantic_views):
+            print(f"  ✅ SEMANTIC VIEW {sv_name}")
+        for sv_name in sorted(semantic_view_names - created_semantic_views):
+            self._add_issue("ERROR", f"Required SEMANTIC VIEW {sv_name} not found in scripts")
                 
         # Additional semantic view validations
         self._validate_semantic_view_components()
@@ -230,22 +230,17 @@ class DryRunIntegrationTest:
     def _validate_semantic_view_components(self):
         """Validate semantic view components (dimensions, metrics, filters)"""
         
-        sql_files = list(self.demo_root.glob("**/*.sql"))
-        
-        for sql_file in sql_files:
-            with open(sql_file, 'r') as f:
-                content = f.read()
-            
+        for sql_file, (content, content_upper, _) in self._read_sql_files().items():
             # Check for required semantic view components
-            if 'CREATE' in content.upper() and 'SEMANTIC VIEW' in content.upper():
+            if 'CREATE' in content_upper and 'SEMANTIC VIEW' in content_upper:
                 # Check for DIMENSIONS section
-                if 'DIMENSIONS' in content.upper():
+                if 'DIMENSIONS' in content_upper:
                     print(f"  ✅ SEMANTIC VIEW has DIMENSIONS section")
                 else:
                     self._add_issue("WARNING", f"Semantic view missing DIMENSIONS section in {sql_file.name}")
                 
                 # Check for METRICS section
-                if 'METRICS' in content.upper():
+                if 'METRICS' in content_upper:
                     print(f"  ✅ SEMANTIC VIEW has METRICS section")
                 else:
                     self._add_issue("WARNING", f"Semantic view missing METRICS section in {sql_file.name}")
@@ -263,7 +258,7 @@ class DryRunIntegrationTest:
                     self._add_issue("INFO", f"Semantic view could benefit from sample values in {sql_file.name}")
                 
                 # Check for relationships (critical for joins)
-                if 'RELATIONSHIPS' in content.upper():
+                if 'RELATIONSHIPS' in content_upper:
                     print(f"  ✅ SEMANTIC VIEW defines table relationships")
                 else:
                     self._add_issue("WARNING", f"Semantic view missing RELATIONSHIPS section in {sql_file.name}")
@@ -310,37 +305,46 @@ class DryRunIntegrationTest:
     
     def _generate_final_report(self):
         """Generate final test report"""
-        print("\n" + "="*60)
-        print("🧪 DRY RUN INTEGRATION TEST RESULTS")
-        print("="*60)
+        lines = [
+            "\n" + "="*60,
+            "🧪 DRY RUN INTEGRATION TEST RESULTS",
+            "="*60,
+        ]
         
         if not self.issues:
-            print("🎉 ALL TESTS PASSED! Demo is ready for deployment.")
-            print("\n✅ VALIDATION SUMMARY:")
-            print("  • SQL syntax: Valid")
-            print("  • Script order: Correct") 
-            print("  • UDF consistency: Verified")
-            print("  • Data flow: Complete")
-            print("  • Workflow: Validated")
+            lines.extend([
+                "🎉 ALL TESTS PASSED! Demo is ready for deployment.",
+                "\n✅ VALIDATION SUMMARY:",
+                "  • SQL syntax: Valid",
+                "  • Script order: Correct",
+                "  • UDF consistency: Verified",
+                "  • Data flow: Complete",
+                "  • Workflow: Validated",
+            ])
+            sys.stdout.write("\n".join(lines) + "\n")
             return
         
-        # Group issues by severity
-        errors = [i for i in self.issues if i["severity"] == "ERROR"]
-        warnings = [i for i in self.issues if i["severity"] == "WARNING"] 
-        info = [i for i in self.issues if i["severity"] == "INFO"]
+        # Group issues by severity in a single pass
+        by_severity = defaultdict(list)
+        for issue in self.issues:
+            by_severity[issue["severity"]].append(issue)
         
-        print(f"📊 SUMMARY: {len(errors)} Errors, {len(warnings)} Warnings, {len(info)} Info")
+        lines.append(f"📊 SUMMARY: {len(by_severity['ERROR'])} Errors, {len(by_severity['WARNING'])} Warnings, "
+                     f"{len(by_severity['INFO'])} Info")
         
-        for severity, issues in [("ERROR", errors), ("WARNING", warnings), ("INFO", info)]:
+        for severity in ("ERROR", "WARNING", "INFO"):
+            issues = by_severity[severity]
             if issues:
-                print(f"\n🔴 {severity}S:")
-                for issue in issues:
-                    print(f"  • {issue['description']}")
+                lines.append(f"\n🔴 {severity}S:")
+                lines.extend(f"  • {issue['description']}" for issue in issues)
         
-        if errors:
-            print("\n❌ INTEGRATION TEST FAILED - Fix errors before deployment")
+        if by_severity["ERROR"]:
+            lines.append("\n❌ INTEGRATION TEST FAILED - Fix errors before deployment")
         else:
-            print("\n⚠️  INTEGRATION TEST PASSED WITH WARNINGS - Review before deployment")
+            lines.append("\n⚠️  INTEGRATION TEST PASSED WITH WARNINGS - Review before deployment")
+        
+        # Emit the whole report with one write instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Intent Routing Tests for the Cortex Analyst chat app
+Checks that route_intent picks the same rule as walking INTENT_RULES with
+plain substring checks, the way the original if/elif chain did.
+Run with `python tests/test_intent_routing.py` or pytest.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app"))
+try:
+    import cortex_analyst_chat as app
+except ImportError:  # streamlit, snowflake and plotly are needed to import the app
+    app = None
+
+
+def walk_rules(question: str):
+    """Reference router: first rule whose keyword groups each have a keyword in the question"""
+    question_lower = question.lower()
+    for rule in app.INTENT_RULES:
+        if all(any(kw in question_lower for kw in group) for group in rule["keywords"]):
+            return rule
+    return app.DEFAULT_INTENT
+
+
+@unittest.skipIf(app is None, "cortex_analyst_chat dependencies are not installed")
+class IntentRoutingTest(unittest.TestCase):
+    def test_sample_questions(self):
+        cases = {
+            "What is our total revenue?": "revenue",
+            "Show me the top customers by value": "top_customers",
+            "Which products are selling best?": "top_products",
+            "What are our high-value orders?": "default",
+            "Show me recent sales trends": "revenue",
+        }
+        for question, intent in cases.items():
+            self.assertEqual(app.route_intent(question)["intent"], intent, question)
+
+    def test_overlapping_keywords_are_all_found(self):
+        self.assertEqual(app.route_intent("productop")["intent"], "top_products")
+        self.assertEqual(app.route_intent("customerbestopxs")["intent"], "top_customers")
+
+    def test_matches_rule_walk_on_random_questions(self):
+        keywords = sorted(app._INTENT_KEYWORD_BITS)
+        fragments = keywords + [kw[:-1] for kw in keywords] + [kw[1:] for kw in keywords] + [" ", "x", "S"]
+        rng = random.Random(0)
+        for _ in range(20000):
+            question = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 6)))
+            self.assertIs(app.route_intent(question), walk_rules(question), question)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+UDF Call Parsing Tests for RDF to Snowflake Semantic Views Demo
+Pins how comprehensive_validation.py splits UDF call arguments.
+Run with `python tests/test_udf_call_parsing.py` or pytest.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comprehensive_validation import SQLValidator, _line_index
+
+
+def extract_calls(sql: str):
+    """Return (name, parameters) for every UDF call found in sql"""
+    validator = SQLValidator(os.path.dirname(os.path.abspath(__file__)))
+    calls = validator._extract_function_calls(Path("test.sql"), sql, sql.upper(), _line_index(sql))
+    return [(call.name, call.parameters) for call in calls]
+
+
+class UDFCallParsingTest(unittest.TestCase):
+    def test_one_level_of_nesting_is_kept_in_one_argument(self):
+        self.assertEqual(
+            extract_calls("SELECT GENERATE_ID(CONCAT(a, b), 2);"),
+            [("GENERATE_ID", ["CONCAT(a, b)", "2"])]
+        )
+
+    def test_deeper_nesting_falls_back_to_first_closing_paren(self):
+        self.assertEqual(
+            extract_calls("SELECT PARSE_RDF_SCHEMA(f(g(x)), y, z);"),
+            [("PARSE_RDF_SCHEMA", ["f(g(x"])]
+        )
+
+    def test_commas_inside_quotes_do_not_split(self):
+        self.assertEqual(
+            extract_calls("SELECT PARSE_RDF_SCHEMA('a, b', \"c, d\", opts);"),
+            [("PARSE_RDF_SCHEMA", ["'a, b'", '"c, d"', "opts"])]
+        )
+
+    def test_nested_same_name_call_is_reported_for_both_calls(self):
+        self.assertEqual(
+            extract_calls("SELECT GENERATE_ID(GENERATE_ID('a'), 'b');"),
+            [
+                ("GENERATE_ID", ["GENERATE_ID('a')", "'b'"]),
+                ("GENERATE_ID", ["'a'"]),
+            ]
+        )
+
+    def test_multiline_arguments(self):
+        self.assertEqual(
+            extract_calls("SELECT LOAD_RDF_DATA(\n  a,\n  b\n);"),
+            [("LOAD_RDF_DATA", ["a", "b"])]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()